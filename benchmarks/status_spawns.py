@@ -0,0 +1,57 @@
+"""Measures how many git processes and how much time a status check costs.
+
+Run with:
+    python -m benchmarks.status_spawns --checks 20
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import git
+
+from core.git import GitManager
+from core.status import StatusChecker
+
+def _create_vault(workdir: Path, notes: int) -> Path:
+    origin = workdir / "origin.git"
+    git.Repo.init(origin, bare=True, initial_branch="main")
+    repo = git.Repo.init(workdir / "vault", initial_branch="main")
+    with repo.config_writer() as cw:
+        cw.set_value("user", "name", "bench")
+        cw.set_value("user", "email", "bench@cogit.invalid")
+    for i in range(notes):
+        (workdir / "vault" / f"note-{i}.md").write_text(f"# Note {i}\n", encoding="utf-8")
+    repo.git.add(A=True)
+    repo.index.commit("initial vault")
+    repo.create_remote("origin", str(origin))
+    repo.git.push("-u", "origin", "main")
+    return workdir / "vault"
+
+def main():
+    parser = argparse.ArgumentParser(description="Count git spawns per status check.")
+    parser.add_argument("--checks", type=int, default=20)
+    parser.add_argument("--notes", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cogit-bench-") as tmp:
+        manager = GitManager(_create_vault(Path(tmp), args.notes))
+        checker = StatusChecker(manager)
+
+        checker.check_status()
+        print(f"First check: {manager.spawn_report()}")
+
+        manager.broker.reset_counts()
+        start = time.perf_counter()
+        for _ in range(args.checks):
+            checker.check_status()
+        elapsed = time.perf_counter() - start
+
+        print(f"Next {args.checks} checks: {manager.spawn_report()}")
+        # The network fetch runs through GitPython and is not counted here
+        print(f"Per check: {manager.broker.spawn_count / args.checks:.1f} spawns "
+              f"plus 1 fetch, {elapsed / args.checks * 1000:.1f} ms")
+        manager.close()
+
+if __name__ == "__main__":
+    main()
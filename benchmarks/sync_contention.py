@@ -0,0 +1,320 @@
+"""Simulates several devices syncing one vault through a shared origin.
+
+Each simulated client owns a clone of a local bare repository and its own
+GitManager. Clients edit random notes and call commit_all/push concurrently,
+retrying when another device won the race. The report shows how long syncs
+take, how often they had to retry or hit merge conflicts, whether every
+clone ended up at the same commit, and how many edits the conflict
+strategy dropped on the way.
+
+Run with:
+    python -m benchmarks.sync_contention --clients 4 --syncs 10
+"""
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import git
+
+from core.config import CogitConfig
+from core.git import GitManager
+
+# How _resolve_conflict settles merge conflicts, shown in the report
+CONFLICT_STRATEGY = "pull -X ours (local side of conflicting hunks wins)"
+
+@dataclass
+class SimulationConfig:
+    clients: int = 3
+    syncs_per_client: int = 5
+    sync_rate: float = 2.0  # mean syncs per second per client
+    notes: int = 10
+    max_retries: int = 5
+    seed: Optional[int] = None
+    branch: str = "main"
+
+@dataclass
+class ClientStats:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    retries: int = 0
+    conflicts: int = 0
+    failures: int = 0
+    # Commits not on origin when the workload ended / after the drain round
+    stranded: int = 0
+    stranded_after_drain: int = 0
+    # Edit lines written, and how many are missing from origin at the end
+    edits: int = 0
+    lost_edits: int = 0
+
+@dataclass
+class SimulationReport:
+    clients: List[ClientStats]
+    converged: bool
+    heads: List[str]
+    duration: float
+
+    @property
+    def latencies(self) -> List[float]:
+        return [lat for client in self.clients for lat in client.latencies]
+
+    @property
+    def syncs(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def retries(self) -> int:
+        return sum(client.retries for client in self.clients)
+
+    @property
+    def conflicts(self) -> int:
+        return sum(client.conflicts for client in self.clients)
+
+    @property
+    def failures(self) -> int:
+        return sum(client.failures for client in self.clients)
+
+    @property
+    def stranded(self) -> int:
+        return sum(client.stranded for client in self.clients)
+
+    @property
+    def stranded_after_drain(self) -> int:
+        return sum(client.stranded_after_drain for client in self.clients)
+
+    @property
+    def edits(self) -> int:
+        return sum(client.edits for client in self.clients)
+
+    @property
+    def lost_edits(self) -> int:
+        return sum(client.lost_edits for client in self.clients)
+
+    @property
+    def conflict_rate(self) -> float:
+        attempts = self.syncs + self.failures
+        return self.conflicts / attempts if attempts else 0.0
+
+    def percentile(self, pct: float) -> float:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        if len(latencies) == 1:
+            return latencies[0]
+        return statistics.quantiles(latencies, n=100, method="inclusive")[int(pct) - 1]
+
+    def format(self) -> str:
+        lines = [
+            f"Clients: {len(self.clients)}  Syncs: {self.syncs}  Failed: {self.failures}",
+            f"Duration: {self.duration:.2f}s",
+            f"Latency p50: {self.percentile(50) * 1000:.0f} ms  "
+            f"p90: {self.percentile(90) * 1000:.0f} ms  "
+            f"p99: {self.percentile(99) * 1000:.0f} ms",
+            f"Retries: {self.retries}  Conflicts: {self.conflicts} "
+            f"({self.conflict_rate:.1%} of syncs)",
+            f"Stranded commits: {self.stranded} after workload, "
+            f"{self.stranded_after_drain} after drain",
+            f"Conflict strategy: {CONFLICT_STRATEGY}",
+            f"Lost edits: {self.lost_edits} of {self.edits}",
+            f"Converged: {'yes' if self.converged else 'no'} (all heads match origin)",
+        ]
+        for client in self.clients:
+            lines.append(
+                f"  {client.name}: {len(client.latencies)} syncs, "
+                f"{client.retries} retries, {client.conflicts} conflicts, "
+                f"{client.stranded} stranded, {client.lost_edits} lost edits"
+            )
+        return "\n".join(lines)
+
+def _set_identity(repo: git.Repo, name: str):
+    with repo.config_writer() as cw:
+        cw.set_value("user", "name", name)
+        cw.set_value("user", "email", f"{name}@cogit.invalid")
+
+def _create_origin(workdir: Path, config: SimulationConfig) -> Path:
+    origin = workdir / "origin.git"
+    git.Repo.init(origin, bare=True, initial_branch=config.branch)
+
+    seed = git.Repo.init(workdir / "seed", initial_branch=config.branch)
+    _set_identity(seed, "seed")
+    for i in range(config.notes):
+        (workdir / "seed" / f"note-{i}.md").write_text(f"# Note {i}\n", encoding="utf-8")
+    seed.git.add(A=True)
+    seed.index.commit("initial vault")
+    seed.git.push(str(origin), f"{config.branch}:{config.branch}")
+    return origin
+
+def _resolve_conflict(repo: git.Repo, branch: str):
+    """Abandons a failed sync merge and redoes it keeping local hunks."""
+    try:
+        repo.git.merge("--abort")
+    except git.GitCommandError:
+        pass
+    repo.git.pull("--no-rebase", "--no-edit", "-X", "ours", "origin", branch)
+
+def _count_lost_edits(origin: Path, branch: str, edits: List[Tuple[str, str]]) -> int:
+    """Counts edit lines that are missing from the notes on origin's branch."""
+    repo = git.Repo(origin)
+    contents = {}
+    lost = 0
+    for note, line in edits:
+        if note not in contents:
+            try:
+                contents[note] = set(repo.git.show(f"{branch}:{note}").splitlines())
+            except git.GitCommandError:
+                contents[note] = set()
+        if line not in contents[note]:
+            lost += 1
+    return lost
+
+class SimulatedClient:
+    def __init__(self, name: str, path: Path, config: SimulationConfig, rng: random.Random):
+        self.name = name
+        self.config = config
+        self.rng = rng
+        self.manager = GitManager(path, CogitConfig(vault_path=path, branch=config.branch))
+        self.stats = ClientStats(name)
+        # (note, line) for every edit, to check nothing was lost at the end
+        self.edits: List[Tuple[str, str]] = []
+
+    def edit(self):
+        note = f"note-{self.rng.randrange(self.config.notes)}.md"
+        line = f"- {self.name} edit {len(self.edits)} at {time.time():.6f}"
+        with open(self.manager.repo_path / note, "a", encoding="utf-8") as f:
+            f.write(f"{line}\n")
+        self.edits.append((note, line))
+        self.stats.edits += 1
+
+    def _push_with_retries(self, record: bool) -> bool:
+        """Pushes, retrying after rejections; only counts stats when record is set."""
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                self.manager.push()
+                return True
+            except RuntimeError as e:
+                repo = self.manager.get_repo()
+                if "conflict" in str(e).lower() or repo.index.unmerged_blobs():
+                    if record:
+                        self.stats.conflicts += 1
+                    _resolve_conflict(repo, self.config.branch)
+                if attempt < self.config.max_retries:
+                    if record:
+                        self.stats.retries += 1
+                    time.sleep(self.rng.uniform(0, 0.05 * (attempt + 1)))
+        return False
+
+    def sync(self):
+        start = time.perf_counter()
+        self.manager.commit_all(f"{self.name}: auto-save")
+        if self._push_with_retries(record=True):
+            self.stats.latencies.append(time.perf_counter() - start)
+        else:
+            self.stats.failures += 1
+
+    def unpushed(self) -> int:
+        """Counts local commits that origin does not have yet."""
+        self.manager.fetch()
+        counts = self.manager.ahead_behind()
+        return counts[0] if counts else 0
+
+    def drain(self) -> bool:
+        """Pushes leftover work without contention; not part of the measurements."""
+        self.manager.commit_all(f"{self.name}: drain")
+        return self._push_with_retries(record=False)
+
+    def run(self, barrier: threading.Barrier):
+        barrier.wait()
+        for _ in range(self.config.syncs_per_client):
+            time.sleep(self.rng.expovariate(self.config.sync_rate))
+            self.edit()
+            self.sync()
+
+def run_simulation(config: SimulationConfig, workdir: Optional[Path] = None) -> SimulationReport:
+    """Runs the simulation and returns a report. Uses a temp dir if workdir is None."""
+    if workdir is None:
+        with tempfile.TemporaryDirectory(prefix="cogit-sim-") as tmp:
+            return run_simulation(config, Path(tmp))
+
+    rng = random.Random(config.seed)
+    origin = _create_origin(workdir, config)
+
+    clients = []
+    for i in range(config.clients):
+        name = f"device-{i}"
+        repo = git.Repo.clone_from(str(origin), workdir / name, branch=config.branch)
+        _set_identity(repo, name)
+        clients.append(SimulatedClient(name, workdir / name, config, random.Random(rng.random())))
+
+    barrier = threading.Barrier(len(clients))
+    threads = [threading.Thread(target=client.run, args=(barrier,)) for client in clients]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    # Clients whose last sync ran out of retries still hold commits. Drain
+    # them one at a time so leftover work is not mistaken for divergence.
+    for client in clients:
+        client.stats.stranded = client.unpushed()
+    for _ in range(len(clients) + 1):
+        pending = [client for client in clients if client.unpushed()]
+        if not pending:
+            break
+        for client in pending:
+            client.drain()
+
+    # Final round: every device pulls whatever the others pushed last
+    for client in clients:
+        try:
+            client.manager.pull()
+        except RuntimeError:
+            client.stats.conflicts += 1
+            _resolve_conflict(client.manager.get_repo(), config.branch)
+
+    for client in clients:
+        client.stats.stranded_after_drain = client.unpushed()
+
+    heads = [client.manager.get_repo().head.commit.hexsha for client in clients]
+    origin_head = git.Repo(origin).commit(config.branch).hexsha
+    converged = all(head == origin_head for head in heads)
+    for client in clients:
+        client.stats.lost_edits = _count_lost_edits(origin, config.branch, client.edits)
+    for client in clients:
+        client.manager.close()
+    return SimulationReport([client.stats for client in clients], converged, heads, duration)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent Cogit syncs.")
+    parser.add_argument("--clients", type=int, default=SimulationConfig.clients)
+    parser.add_argument("--syncs", type=int, default=SimulationConfig.syncs_per_client,
+                        help="syncs per client")
+    parser.add_argument("--rate", type=float, default=SimulationConfig.sync_rate,
+                        help="mean syncs per second per client")
+    parser.add_argument("--notes", type=int, default=SimulationConfig.notes)
+    parser.add_argument("--retries", type=int, default=SimulationConfig.max_retries)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    # Rejected pushes are expected here; GitPython logs each one as a warning
+    logging.getLogger("git").setLevel(logging.ERROR)
+
+    config = SimulationConfig(
+        clients=args.clients,
+        syncs_per_client=args.syncs,
+        sync_rate=args.rate,
+        notes=args.notes,
+        max_retries=args.retries,
+        seed=args.seed,
+    )
+    print(run_simulation(config).format())
+
+if __name__ == "__main__":
+    main()
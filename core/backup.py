@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import git
+
+from core.git import GitManager
+
+MANIFEST_NAME = "manifest.json"
+
+@dataclass
+class BundleEntry:
+    file: str
+    created: str
+    tips: Dict[str, str]
+    excluded: List[str] = field(default_factory=list)
+    sha256: str = ""
+    commits: int = 0
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(backup_dir: Path) -> List[BundleEntry]:
+    manifest = backup_dir / MANIFEST_NAME
+    if not manifest.exists():
+        return []
+    with open(manifest, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [BundleEntry(**entry) for entry in data.get("bundles", [])]
+
+def save_manifest(backup_dir: Path, entries: List[BundleEntry]):
+    """Writes the manifest atomically so a crash never leaves it half written."""
+    manifest = backup_dir / MANIFEST_NAME
+    tmp = manifest.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"bundles": [asdict(entry) for entry in entries]}, f, indent=2)
+    os.replace(tmp, manifest)
+
+class BundleBackup:
+    """Incremental offline backups of the vault as git bundles.
+
+    Each bundle only holds commits that are not reachable from the tips
+    recorded by earlier bundles, so a backup costs time proportional to the
+    work done since the last one. The manifest lists bundles in restore order.
+    """
+
+    def __init__(self, git_manager: GitManager, backup_dir: Optional[Path] = None):
+        self.git = git_manager
+        self.backup_dir = backup_dir or git_manager.config.backup_dir
+
+    def _require_dir(self) -> Path:
+        if not self.backup_dir:
+            raise RuntimeError("No backup directory configured.")
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        return self.backup_dir
+
+    def create(self) -> str:
+        """Writes a bundle with the commits made since the last backup."""
+        backup_dir = self._require_dir()
+        repo = self.git.get_repo()
+        broker = self.git.broker
+        entries = load_manifest(backup_dir)
+
+        ref = f"refs/heads/{self.git.config.branch}"
+        tip = broker.resolve(ref)
+        if tip is None:
+            raise RuntimeError(f"Branch '{self.git.config.branch}' has no commits to back up.")
+
+        excluded = self._excluded_tips(entries)
+
+        revs = [ref, "--not", *excluded] if excluded else [ref]
+        count = int(broker.run("rev-list", "--count", *revs).strip())
+        if count == 0:
+            return "No new commits to back up."
+
+        name = f"{len(entries) + 1:04d}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.bundle"
+        tmp_path = backup_dir / f"{name}.tmp"
+        try:
+            repo.git.bundle("create", str(tmp_path), *revs)
+            repo.git.bundle("verify", "--quiet", str(tmp_path))
+        except git.GitCommandError as e:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"Backup failed: {e}")
+        os.replace(tmp_path, backup_dir / name)
+
+        entries.append(BundleEntry(
+            file=name,
+            created=datetime.now().isoformat(timespec="seconds"),
+            tips={ref: tip},
+            excluded=excluded,
+            sha256=_sha256(backup_dir / name),
+            commits=count,
+        ))
+        save_manifest(backup_dir, entries)
+        return f"Backed up {count} commit(s) to {name}."
+
+    def _excluded_tips(self, entries: List[BundleEntry]) -> List[str]:
+        """Returns the smallest set of commits that covers everything backed up.
+
+        Starts from the latest recorded tip of each ref plus what the previous
+        bundle excluded, then drops any commit that is an ancestor of another.
+        This is normally a single commit, however many backups exist.
+        """
+        if not entries:
+            return []
+        latest: Dict[str, str] = {}
+        for entry in entries:
+            latest.update(entry.tips)
+        previous = list(dict.fromkeys([*latest.values(), *entries[-1].excluded]))
+
+        # Tips that no longer exist locally (e.g. after a rewrite) are skipped
+        existing = [
+            info.sha for info in self.git.broker.object_info(previous)
+            if info is not None and info.type == "commit"
+        ]
+        if len(existing) < 2:
+            return existing
+        return self.git.broker.run("merge-base", "--independent", *existing).split()
+
+    def verify(self) -> List[str]:
+        """Checks every bundle in the manifest; returns a list of problems."""
+        backup_dir = self._require_dir()
+        repo = self.git.get_repo()
+        problems = []
+        for entry in load_manifest(backup_dir):
+            path = backup_dir / entry.file
+            if not path.exists():
+                problems.append(f"{entry.file}: missing")
+                continue
+            if _sha256(path) != entry.sha256:
+                problems.append(f"{entry.file}: checksum mismatch")
+                continue
+            try:
+                repo.git.bundle("verify", "--quiet", str(path))
+            except git.GitCommandError as e:
+                problems.append(f"{entry.file}: {e.stderr.strip() if e.stderr else e}")
+        return problems
+
+def restore_backup(backup_dir: Path, target: Path) -> git.Repo:
+    """Rebuilds a repository at target by applying every bundle in order."""
+    entries = load_manifest(backup_dir)
+    if not entries:
+        raise RuntimeError(f"No backups found in {backup_dir}")
+
+    head_ref = next(iter(entries[-1].tips))
+    repo = git.Repo.init(target, initial_branch=head_ref.removeprefix("refs/heads/"))
+    for entry in entries:
+        path = backup_dir / entry.file
+        if _sha256(path) != entry.sha256:
+            raise RuntimeError(f"Backup {entry.file} is corrupted (checksum mismatch).")
+        # Verifying against the partly restored repo also checks the chain
+        repo.git.bundle("verify", "--quiet", str(path))
+        refspecs = [f"+{ref}:{ref}" for ref in entry.tips]
+        repo.git.fetch("--update-head-ok", str(path), *refspecs)
+    repo.git.reset("--hard")
+    return repo
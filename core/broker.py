@@ -0,0 +1,209 @@
+import subprocess
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Keep windowed builds from flashing a console for every git call
+_CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+BATCH_CHECK_FORMAT = "%(objectname) %(objecttype) %(objectsize) %(objectsize:disk)"
+
+@dataclass
+class ObjectInfo:
+    sha: str
+    type: str
+    size: int
+    disk_size: int
+
+class _BatchHelper:
+    """A long-lived `git cat-file` process answering one request per line."""
+
+    def __init__(self, broker: "GitBroker", args: List[str]):
+        self.broker = broker
+        self.args = args
+        # Labelled by mode, e.g. "cat-file --batch-check"
+        self.label = f"{args[0]} {args[1].split('=')[0]}"
+        self.proc: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = self.broker._spawn(self.args, self.label)
+        return self.proc
+
+    def request(self, lines: List[str], read_body: bool = False) -> List[Tuple[str, Optional[bytes]]]:
+        """Sends all lines and returns (header, body) for each, in order."""
+        if not lines:
+            return []
+        with self.lock:
+            proc = self._ensure_started()
+            payload = "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+            # Write from a thread so large batches cannot deadlock on full pipes
+            writer = threading.Thread(target=self._write, args=(proc, payload))
+            writer.start()
+            results = []
+            for _ in lines:
+                header = proc.stdout.readline().decode("utf-8").rstrip("\n")
+                if not header:
+                    # The helper died; drop it so the next request respawns it
+                    self._discard(proc)
+                    writer.join()
+                    raise RuntimeError(f"git {self.label} failed: helper exited unexpectedly")
+                body = None
+                if read_body and not header.endswith((" missing", " ambiguous")):
+                    size = int(header.split(" ")[2])
+                    body = proc.stdout.read(size)
+                    proc.stdout.read(1)  # trailing newline
+                results.append((header, body))
+            writer.join()
+            return results
+
+    @staticmethod
+    def _write(proc: subprocess.Popen, payload: bytes):
+        try:
+            proc.stdin.write(payload)
+            proc.stdin.flush()
+        except OSError:
+            # The reader notices the dead helper and reports it
+            pass
+
+    def _discard(self, proc: subprocess.Popen):
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        self.proc = None
+
+    def close(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+        self.proc = None
+
+class GitBroker:
+    """Routes read-only git queries through as few processes as possible.
+
+    Object lookups share persistent `cat-file --batch-check` / `--batch`
+    helpers, and other queries are answered by a single batched command each.
+    Every process started is counted so benchmarks can check the totals.
+    """
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self.spawns: Counter = Counter()
+        self._batch_check = _BatchHelper(self, ["cat-file", f"--batch-check={BATCH_CHECK_FORMAT}"])
+        self._batch = _BatchHelper(self, ["cat-file", "--batch"])
+
+    @property
+    def spawn_count(self) -> int:
+        return sum(self.spawns.values())
+
+    def reset_counts(self):
+        self.spawns.clear()
+
+    def report(self) -> str:
+        """Summarizes process spawns by git subcommand."""
+        parts = [f"{name}={count}" for name, count in sorted(self.spawns.items())]
+        return f"{self.spawn_count} git process(es): " + (", ".join(parts) or "none")
+
+    def _spawn(self, args: List[str], label: str) -> subprocess.Popen:
+        self.spawns[label] += 1
+        return subprocess.Popen(
+            ["git", *args],
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            creationflags=_CREATION_FLAGS,
+        )
+
+    def run(self, *args: str, input: Optional[str] = None, ok_codes: Tuple[int, ...] = (0,)) -> str:
+        """Runs a one-shot git command and returns its stdout.
+
+        Exit codes listed in ok_codes are not treated as failures.
+        """
+        self.spawns[args[0]] += 1
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.repo_path,
+            input=input,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            creationflags=_CREATION_FLAGS,
+        )
+        if result.returncode not in ok_codes:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def stream(self, *args: str) -> Iterator[str]:
+        """Runs a git command and yields its stdout line by line as it arrives."""
+        self.spawns[args[0]] += 1
+        proc = subprocess.Popen(
+            ["git", *args],
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=_CREATION_FLAGS,
+        )
+        try:
+            for line in proc.stdout:
+                yield line.rstrip("\n")
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            if proc.wait() != 0 and stderr:
+                raise RuntimeError(f"git {args[0]} failed: {stderr.strip()}")
+
+    def object_info(self, revs: Iterable[str]) -> List[Optional[ObjectInfo]]:
+        """Looks up type and sizes for each rev; None where it does not exist."""
+        infos = []
+        for header, _ in self._batch_check.request(list(revs)):
+            if header.endswith((" missing", " ambiguous")):
+                infos.append(None)
+                continue
+            sha, obj_type, size, disk_size = header.split(" ")
+            infos.append(ObjectInfo(sha, obj_type, int(size), int(disk_size)))
+        return infos
+
+    def resolve(self, rev: str) -> Optional[str]:
+        info = self.object_info([rev])[0]
+        return info.sha if info else None
+
+    def read_object(self, rev: str) -> Optional[bytes]:
+        """Returns the raw contents of an object, or None if it does not exist."""
+        _, body = self._batch.request([rev], read_body=True)[0]
+        return body
+
+    def commit_time(self, rev: str) -> Optional[float]:
+        """Returns the committer timestamp of a commit."""
+        body = self.read_object(rev)
+        if body is None:
+            return None
+        for line in body.decode("utf-8", errors="replace").splitlines():
+            if not line:
+                break
+            if line.startswith("committer "):
+                return float(line.rsplit(" ", 2)[1])
+        return None
+
+    def ahead_behind(self, local: str, remote: str) -> Tuple[int, int]:
+        """Counts commits only in local and only in remote with one rev-list."""
+        output = self.run("rev-list", "--left-right", "--count", f"{local}...{remote}")
+        ahead, behind = output.split()
+        return int(ahead), int(behind)
+
+    def is_dirty(self) -> bool:
+        """True if there are staged, unstaged or untracked changes."""
+        return bool(self.run("status", "--porcelain", "--untracked-files=normal").strip())
+
+    def close(self):
+        self._batch_check.close()
+        self._batch.close()
@@ -1,22 +1,47 @@
 from dataclasses import dataclass
 from pathlib import Path
 import os
+import math
+import logging
 import tomlkit
 from typing import Optional
 
 CONFIG_DIR = Path.home() / ".config" / "cogit"
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 
+LARGE_FILE_ACTIONS = ("block", "warn", "suggest")
+
 @dataclass
 class CogitConfig:
     vault_path: Path
     branch: str = "main"
+    fetch_tags: bool = False
+    # Pre-push size guard (GitHub rejects blobs over 100 MB and pushes over 2 GB)
+    max_file_size_mb: float = 100.0
+    max_push_size_mb: float = 2000.0
+    large_file_action: str = "block"  # "block", "warn" or "suggest"
+    # Local folder (e.g. a USB drive) for incremental bundle backups
+    backup_dir: Optional[Path] = None
 
     @property
     def repo_path(self) -> Path:
         """Alias for vault_path, since they are now the same."""
         return self.vault_path
 
+def _read_size_mb(table, key: str, default: float) -> float:
+    """Reads a positive size in MB, falling back to the default if invalid."""
+    value = table.get(key, default)
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        size = float(value)
+        if not math.isfinite(size) or size <= 0:
+            raise ValueError
+        return size
+    except (TypeError, ValueError):
+        logging.warning(f"Invalid {key} '{value}' in config; using {default:g}.")
+        return default
+
 def load_config() -> Optional[CogitConfig]:
     """Loads configuration from CONFIG_FILE."""
     if not CONFIG_FILE.exists():
@@ -29,13 +54,29 @@ def load_config() -> Optional[CogitConfig]:
         vault_path = Path(data.get("vault", {}).get("path", ""))
         repo_data = data.get("git", {})
         branch = repo_data.get("branch", "main")
+        fetch_tags = bool(repo_data.get("fetch_tags", False))
+        push_data = data.get("push", {})
+        backup_path = data.get("backup", {}).get("path", "")
+
+        large_file_action = push_data.get("large_file_action", "block")
+        if large_file_action not in LARGE_FILE_ACTIONS:
+            logging.warning(
+                f"Unknown large_file_action '{large_file_action}' in config, "
+                f"expected one of {', '.join(LARGE_FILE_ACTIONS)}; using 'block'."
+            )
+            large_file_action = "block"
 
         if not str(vault_path) or str(vault_path) == ".":
              return None 
 
         return CogitConfig(
             vault_path=vault_path,
-            branch=branch
+            branch=branch,
+            fetch_tags=fetch_tags,
+            max_file_size_mb=_read_size_mb(push_data, "max_file_size_mb", 100.0),
+            max_push_size_mb=_read_size_mb(push_data, "max_push_size_mb", 2000.0),
+            large_file_action=large_file_action,
+            backup_dir=Path(backup_path) if backup_path else None
         )
     except Exception as e:
         print(f"Error loading config: {e}")
@@ -53,7 +94,19 @@ def save_config(config: CogitConfig):
 
     git_table = tomlkit.table()
     git_table["branch"] = config.branch
+    git_table["fetch_tags"] = config.fetch_tags
     doc["git"] = git_table
 
+    push_table = tomlkit.table()
+    push_table["max_file_size_mb"] = config.max_file_size_mb
+    push_table["max_push_size_mb"] = config.max_push_size_mb
+    push_table["large_file_action"] = config.large_file_action
+    doc["push"] = push_table
+
+    if config.backup_dir:
+        backup_table = tomlkit.table()
+        backup_table["path"] = str(config.backup_dir)
+        doc["backup"] = backup_table
+
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
         tomlkit.dump(doc, f)
@@ -1,11 +1,36 @@
 import git
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
+
+from core.broker import GitBroker
+from core.config import CogitConfig
+
+MB = 1024 * 1024
+
+@dataclass
+class OutgoingBlob:
+    sha: str
+    path: str
+    size: int
+
+@dataclass
+class PushScanResult:
+    object_count: int = 0
+    estimated_pack_size: int = 0
+    oversized: List[OutgoingBlob] = field(default_factory=list)
+    pack_too_large: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.oversized and not self.pack_too_large
 
 class GitManager:
-    def __init__(self, repo_path: Path):
+    def __init__(self, repo_path: Path, config: Optional[CogitConfig] = None):
         self.repo_path = repo_path
+        self.config = config or CogitConfig(vault_path=repo_path)
         self.repo: Optional[git.Repo] = None
+        self.broker: Optional[GitBroker] = None
         
     def _ensure_repo(self):
         if not self.repo:
@@ -15,17 +40,74 @@ class GitManager:
                 raise ValueError(f"Invalid git repository at {self.repo_path}")
             except git.NoSuchPathError:
                 raise ValueError(f"Path does not exist: {self.repo_path}")
+            # Read-only queries go through the broker to avoid a process per call
+            self.broker = GitBroker(self.repo_path)
 
     def get_repo(self) -> git.Repo:
         self._ensure_repo()
         return self.repo
 
+    def close(self):
+        """Stops the long-lived git helper processes."""
+        if self.broker:
+            self.broker.close()
+
+    def check_branch(self):
+        """Raises if the checked out branch is not the configured one."""
+        self._ensure_repo()
+        try:
+            current = self.repo.active_branch.name
+        except TypeError:
+            raise RuntimeError("HEAD is detached; check out the configured branch first.")
+        if current != self.config.branch:
+            raise RuntimeError(
+                f"Checked out branch '{current}' does not match configured branch "
+                f"'{self.config.branch}'."
+            )
+
+    def _remote_ref(self) -> str:
+        return f"refs/remotes/origin/{self.config.branch}"
+
+    def _fetch_refspec(self) -> str:
+        branch = self.config.branch
+        return f"+refs/heads/{branch}:refs/remotes/origin/{branch}"
+
+    def _push_refspec(self) -> str:
+        branch = self.config.branch
+        return f"refs/heads/{branch}:refs/heads/{branch}"
+
+    def _tag_options(self) -> dict:
+        # Tags are only transferred when explicitly opted in
+        return {"tags": True} if self.config.fetch_tags else {"no_tags": True}
+
+    def _pull_options(self) -> dict:
+        # Merge explicitly; newer git refuses divergent pulls without a strategy
+        return {"no_rebase": True, **self._tag_options()}
+
+    def fetch(self):
+        """Fetches only the configured branch from origin."""
+        self._ensure_repo()
+        return self.repo.remotes.origin.fetch(self._fetch_refspec(), **self._tag_options())
+
+    def ahead_behind(self) -> Optional[Tuple[int, int]]:
+        """Returns (local-only, remote-only) commit counts, or None without a remote branch."""
+        self._ensure_repo()
+        if self.broker.resolve(self._remote_ref()) is None:
+            return None
+        return self.broker.ahead_behind("HEAD", self._remote_ref())
+
+    def spawn_report(self) -> str:
+        """Summarizes git processes started for read-only queries."""
+        self._ensure_repo()
+        return self.broker.report()
+
     def pull(self) -> str:
         """Pulls changes from remote."""
         self._ensure_repo()
         try:
+            self.check_branch()
             origin = self.repo.remotes.origin
-            fetch_info = origin.pull()
+            fetch_info = origin.pull(self._fetch_refspec(), **self._pull_options())
             if not fetch_info:
                 return "No changes pulled."
             # Summarize what happened
@@ -39,7 +121,7 @@ class GitManager:
     def has_changes(self) -> bool:
         """Checks if there are uncommitted changes."""
         self._ensure_repo()
-        return self.repo.is_dirty(untracked_files=True)
+        return self.broker.is_dirty()
 
     def commit_all(self, message: str) -> str:
         """Stages all changes and commits them."""
@@ -64,36 +146,29 @@ class GitManager:
         messages = []
         
         try:
+            self.check_branch()
             origin = self.repo.remotes.origin
             
             # Fetch to check if remote has changes
-            origin.fetch()
-            
-            # Check if remote is ahead of local
-            active_branch = self.repo.active_branch
-            tracking_branch = active_branch.tracking_branch()
+            self.fetch()
             
-            remote_ahead = False
-            if tracking_branch:
-                local_commit = self.repo.head.commit
-                remote_commit = tracking_branch.commit
-                # Check if remote has commits we don't have
-                remote_ahead = local_commit != remote_commit and \
-                    remote_commit not in self.repo.merge_base(local_commit, remote_commit)
+            # Check if remote has commits we don't have
+            counts = self.ahead_behind()
+            remote_ahead = counts is not None and counts[1] > 0
             
             # Only do stash-pull-pop if remote is ahead
             if remote_ahead:
                 had_stash = False
                 
                 # Step 1: Stash local changes if any exist
-                if self.repo.is_dirty(untracked_files=True):
+                if self.has_changes():
                     self.repo.git.stash('push', '-u', '-m', 'Auto-stash before sync')
                     had_stash = True
                     messages.append("Stashed local changes.")
                 
                 # Step 2: Pull remote changes
                 try:
-                    origin.pull()
+                    origin.pull(self._fetch_refspec(), **self._pull_options())
                     messages.append("Pulled remote changes.")
                 except Exception as pull_error:
                     # If pull fails and we stashed, try to restore
@@ -116,8 +191,17 @@ class GitManager:
                             "Run 'git stash pop' manually to resolve conflicts."
                         )
             
-            # Step 4: Push to remote
-            push_info_list = origin.push()
+            # Step 4: Check what we are about to send before uploading anything
+            scan = self.scan_outgoing()
+            if not scan.ok:
+                report = self._format_scan_report(scan)
+                if self.config.large_file_action == "warn":
+                    messages.append(f"Warning: {report}")
+                else:
+                    raise RuntimeError(f"Push blocked: {report}")
+
+            # Step 5: Push to remote
+            push_info_list = origin.push(self._push_refspec())
             
             # Check for errors in push info
             errors = []
@@ -136,14 +220,64 @@ class GitManager:
         except Exception as e:
             raise RuntimeError(f"Push failed: {e}")
 
+    def scan_outgoing(self) -> PushScanResult:
+        """Lists objects that the next push would send and measures them.
+
+        Objects are those reachable from HEAD but not from any origin ref.
+        Sizes come from the broker's persistent `cat-file --batch-check`,
+        so the cost does not grow with one process per object.
+        """
+        self._ensure_repo()
+        result = PushScanResult()
+        max_file_size = int(self.config.max_file_size_mb * MB)
+
+        output = self.broker.run("rev-list", "--objects", "HEAD", "--not", "--remotes=origin")
+        objects = [line.split(" ", 1) for line in output.splitlines() if line]
+        infos = self.broker.object_info(obj[0] for obj in objects)
+
+        for obj, info in zip(objects, infos):
+            if info is None:
+                continue
+            path = obj[1] if len(obj) > 1 else ""
+            result.object_count += 1
+            result.estimated_pack_size += info.disk_size
+            if info.type == "blob" and info.size > max_file_size:
+                result.oversized.append(OutgoingBlob(info.sha, path, info.size))
+
+        result.pack_too_large = result.estimated_pack_size > self.config.max_push_size_mb * MB
+        return result
+
+    def _format_scan_report(self, scan: PushScanResult) -> str:
+        lines = []
+        if scan.oversized:
+            lines.append(
+                f"{len(scan.oversized)} file(s) exceed {self.config.max_file_size_mb:g} MB:"
+            )
+            for blob in scan.oversized:
+                lines.append(f"  {blob.path or blob.sha} ({blob.size / MB:.1f} MB)")
+        if scan.pack_too_large:
+            lines.append(
+                f"Estimated push size {scan.estimated_pack_size / MB:.1f} MB exceeds "
+                f"{self.config.max_push_size_mb:g} MB."
+            )
+        if self.config.large_file_action == "suggest" and scan.oversized:
+            # Resetting to the remote branch covers the files whichever unpushed
+            # commit added them; the changes themselves stay staged
+            lines.append(
+                "Move these attachments out of the vault (or add them to .gitignore), "
+                "then recommit your unpushed work without them:"
+            )
+            lines.append(f"  git reset --soft {self._remote_ref()}")
+            for blob in scan.oversized:
+                if blob.path:
+                    lines.append(f'  git rm --cached "{blob.path}"')
+            lines.append('  git commit -m "Recommit without large files"')
+        return "\n".join(lines)
+
     def get_last_remote_timestamp(self) -> Optional[float]:
-        """Returns the timestamp of the last commit on the tracking branch."""
+        """Returns the timestamp of the last commit on the remote branch."""
         self._ensure_repo()
         try:
-            active_branch = self.repo.active_branch
-            tracking_branch = active_branch.tracking_branch()
-            if tracking_branch:
-                return tracking_branch.commit.committed_date
-            return None
+            return self.broker.commit_time(self._remote_ref())
         except Exception:
             return None
@@ -0,0 +1,232 @@
+import codecs
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
+
+from core.git import GitManager
+
+MANAGED_HEADER = "# Cogit managed ignores"
+MANAGED_FOOTER = "# End Cogit managed ignores"
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "ignore" / "gitignore_template"
+
+DEFAULT_RULES = [
+    ".obsidian/workspace*",
+    ".obsidian/cache",
+    ".obsidian/plugins/*/data.json",
+]
+
+# Notes are the vault's content; they churn because people write in them
+PROTECTED_SUFFIXES = (".md", ".canvas")
+
+GITIGNORE_SPECIAL = set("\\*?[]!#")
+
+def path_to_rule(path: str, directory: bool = False) -> str:
+    """Builds a gitignore rule matching exactly this path from the vault root.
+
+    The leading slash anchors the rule so it does not match the same name in
+    subfolders, and wildcard or comment characters are escaped.
+    """
+    escaped = "".join(f"\\{ch}" if ch in GITIGNORE_SPECIAL else ch for ch in path)
+    # Leading and trailing spaces would otherwise be trimmed or misread
+    stripped = escaped.rstrip(" ")
+    escaped = stripped + "\\ " * (len(escaped) - len(stripped))
+    if escaped.startswith(" "):
+        escaped = "\\" + escaped
+    return f"/{escaped}/" if directory else f"/{escaped}"
+
+def load_template_rules() -> List[str]:
+    """Reads the default rules shipped in ignore/gitignore_template."""
+    try:
+        with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return list(DEFAULT_RULES)
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+def _split_managed_block(lines: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Splits .gitignore lines into (before, managed rules, after).
+
+    Older versions appended the header without a footer; such a block ends
+    at the first blank line.
+    """
+    if MANAGED_HEADER not in lines:
+        return lines, [], []
+    start = lines.index(MANAGED_HEADER)
+    if MANAGED_FOOTER in lines[start:]:
+        end = lines.index(MANAGED_FOOTER, start)
+        after = lines[end + 1:]
+    else:
+        end = start + 1
+        while end < len(lines) and lines[end].strip():
+            end += 1
+        after = lines[end:]
+    rules = [line for line in lines[start + 1:end] if line.strip()]
+    return lines[:start], rules, after
+
+def read_managed_rules(gitignore: Path) -> List[str]:
+    if not gitignore.exists():
+        return []
+    with open(gitignore, "r", encoding="utf-8") as f:
+        return _split_managed_block(f.read().splitlines())[1]
+
+def write_managed_rules(gitignore: Path, rules: List[str]):
+    """Replaces the managed block in .gitignore, leaving user rules untouched."""
+    lines = []
+    if gitignore.exists():
+        with open(gitignore, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    before, _, after = _split_managed_block(lines)
+
+    # Keep order, drop duplicates
+    unique_rules = list(dict.fromkeys(rule for rule in rules if rule.strip()))
+    block = [MANAGED_HEADER, *unique_rules, MANAGED_FOOTER]
+    if before and before[-1].strip():
+        block.insert(0, "")
+
+    with open(gitignore, "w", encoding="utf-8") as f:
+        f.write("\n".join(before + block + after) + "\n")
+
+def ensure_managed_rules(vault_path: Path):
+    """Makes sure the template rules are in the vault's managed block."""
+    gitignore = vault_path / ".gitignore"
+    current = read_managed_rules(gitignore)
+    missing = [rule for rule in load_template_rules() if rule not in current]
+    if missing or not current:
+        write_managed_rules(gitignore, current + missing)
+
+@dataclass
+class PathChurn:
+    path: str
+    changes: int = 0
+    bytes_added: int = 0
+
+@dataclass
+class IgnoreProposal:
+    rule: str
+    paths: List[str] = field(default_factory=list)
+    changes: int = 0
+    bytes_added: int = 0
+
+class ChurnAnalyzer:
+    """Finds files that change constantly and proposes ignore rules for them."""
+
+    def __init__(self, git_manager: GitManager, max_commits: int = 500,
+                 min_changes: int = 5, group_threshold: int = 3):
+        self.git = git_manager
+        self.max_commits = max_commits
+        self.min_changes = min_changes
+        self.group_threshold = group_threshold
+
+    def analyze(self) -> List[PathChurn]:
+        """Ranks paths by change count and bytes added over recent history.
+
+        History is read in one streaming `git log --raw` pass; the sizes of
+        the blobs each change introduced are then looked up in one batch.
+        """
+        self.git.get_repo()
+        broker = self.git.broker
+
+        churn: Dict[str, PathChurn] = {}
+        new_blobs: List[Tuple[str, str]] = []
+        for line in broker.stream(
+            "log", f"-n{self.max_commits}",
+            "--no-merges", "--no-renames", "--raw", "--no-abbrev", "--format=",
+        ):
+            # :100644 100644 <old> <new> M\t<path>
+            if not line.startswith(":"):
+                continue
+            meta, path = line.split("\t", 1)
+            if path.startswith('"'):
+                # Unusual characters come back C-quoted
+                path = codecs.escape_decode(path[1:-1])[0].decode("utf-8")
+            new_sha, status = meta.split(" ")[3:5]
+            entry = churn.setdefault(path, PathChurn(path))
+            entry.changes += 1
+            if status != "D":
+                new_blobs.append((path, new_sha))
+
+        for (path, _), info in zip(new_blobs, broker.object_info(sha for _, sha in new_blobs)):
+            if info is not None:
+                churn[path].bytes_added += info.size
+
+        return sorted(churn.values(), key=lambda c: (c.changes, c.bytes_added), reverse=True)
+
+    def propose(self, ranked: Optional[List[PathChurn]] = None) -> List[IgnoreProposal]:
+        """Turns high-churn, non-note paths into ignore rules.
+
+        Paths already covered by .gitignore are skipped. A directory gets a
+        single rule only when every tracked file under it is churning, so a
+        rule never covers notes or other files that were not proposed.
+        """
+        if ranked is None:
+            ranked = self.analyze()
+        candidates = [
+            c for c in ranked
+            if c.changes >= self.min_changes and not c.path.endswith(PROTECTED_SUFFIXES)
+        ]
+        ignored = self._ignored([c.path for c in candidates])
+        candidates = [c for c in candidates if c.path not in ignored]
+
+        by_dir: Dict[str, List[PathChurn]] = defaultdict(list)
+        for c in candidates:
+            by_dir[str(PurePosixPath(c.path).parent)].append(c)
+
+        candidate_paths = {c.path for c in candidates}
+        tracked = self._tracked_files() if candidates else []
+
+        proposals = []
+        for directory, entries in by_dir.items():
+            under = [path for path in tracked if path.startswith(f"{directory}/")]
+            if (directory != "." and len(entries) >= self.group_threshold
+                    and all(path in candidate_paths for path in under)):
+                groups = [(path_to_rule(directory, directory=True), entries)]
+            else:
+                groups = [(path_to_rule(entry.path), [entry]) for entry in entries]
+            for rule, group in groups:
+                proposals.append(IgnoreProposal(
+                    rule=rule,
+                    paths=[c.path for c in group],
+                    changes=sum(c.changes for c in group),
+                    bytes_added=sum(c.bytes_added for c in group),
+                ))
+        return sorted(proposals, key=lambda p: (p.bytes_added, p.changes), reverse=True)
+
+    def _tracked_files(self) -> List[str]:
+        output = self.git.broker.run("ls-files", "-z")
+        return [path for path in output.split("\0") if path]
+
+    def _ignored(self, paths: List[str]) -> set:
+        if not paths:
+            return set()
+        # NUL-separated so non-ASCII names come back unquoted; exit code 1
+        # only means that none of the paths is ignored
+        output = self.git.broker.run(
+            "check-ignore", "-z", "--no-index", "--stdin",
+            input="\0".join(paths) + "\0", ok_codes=(0, 1)
+        )
+        return {path for path in output.split("\0") if path}
+
+    def apply(self, proposals: List[IgnoreProposal], untrack: bool = False) -> str:
+        """Adds proposed rules to the managed block, optionally untracking the paths."""
+        gitignore = self.git.repo_path / ".gitignore"
+        rules = read_managed_rules(gitignore)
+        added = [p.rule for p in proposals if p.rule not in rules]
+        write_managed_rules(gitignore, rules + added)
+        messages = [f"Added {len(added)} ignore rule(s)."]
+
+        if untrack:
+            repo = self.git.get_repo()
+            # Only files matched by the applied rules, not other ignored-but-tracked files
+            excludes = [f"--exclude={p.rule}" for p in proposals]
+            output = repo.git.ls_files("-z", "-ci", *excludes) if excludes else ""
+            # Notes are never removed from the index, whatever the rules say
+            tracked = [
+                path for path in output.split("\0")
+                if path and not path.endswith(PROTECTED_SUFFIXES)
+            ]
+            if tracked:
+                repo.git.rm("--cached", "--quiet", "--", *tracked)
+                messages.append(f"Stopped tracking {len(tracked)} file(s).")
+        return "\n".join(messages)
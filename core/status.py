@@ -21,29 +21,24 @@ class StatusChecker:
 
     def check_status(self) -> StatusResult:
         try:
-            repo = self.git.get_repo()
-            
+            # Only the configured branch is compared against its remote
+            self.git.check_branch()
+
             # Fetch explicitly to update remote refs
-            repo.remotes.origin.fetch()
+            self.git.fetch()
 
             # Check for uncommitted changes (dirty working tree)
             if self.git.has_changes():
                  return StatusResult(RepoState.LOCAL_AHEAD, "Uncommitted changes present.", "")
 
-            # Get current branch
-            active_branch = repo.active_branch
-            tracking_branch = active_branch.tracking_branch()
+            # Count commits on each side with a single rev-list
+            counts = self.git.ahead_behind()
 
-            if not tracking_branch:
-                return StatusResult(RepoState.ERROR, "No tracking branch configured.", "")
+            if counts is None:
+                return StatusResult(RepoState.ERROR, "No remote branch to compare with.", "")
 
-            # Compare commits
-            local_commit = active_branch.commit
-            remote_commit = tracking_branch.commit
+            ahead, behind = counts
 
-            # Bases
-            base = repo.merge_base(active_branch, tracking_branch)
-            
             # Retrieve last sync time (from tracking branch)
             last_sync = ""
             ts = self.git.get_last_remote_timestamp()
@@ -57,17 +52,15 @@ class StatusChecker:
                 else:
                     last_sync = dt.strftime("%Y-%m-%d %H:%M")
 
-            if local_commit == remote_commit:
+            if ahead == 0 and behind == 0:
                 return StatusResult(RepoState.UP_TO_DATE, "Repository is up to date.", last_sync)
             
-            # Check if local is ahead
-            # If remote is an ancestor of local, we are ahead
-            if repo.is_ancestor(remote_commit, local_commit):
+            # Only local has new commits, we are ahead
+            if behind == 0:
                  return StatusResult(RepoState.LOCAL_AHEAD, "You have unpushed changes.", last_sync)
 
-            # Check if remote is ahead
-            # If local is an ancestor of remote, we are behind
-            if repo.is_ancestor(local_commit, remote_commit):
+            # Only remote has new commits, we are behind
+            if ahead == 0:
                 return StatusResult(RepoState.REMOTE_AHEAD, "Remote has new changes.", last_sync)
 
             # If neither, we have diverged
@@ -4,36 +4,13 @@ from pathlib import Path
 from PyQt6.QtWidgets import QApplication
 
 from core.config import load_config, CogitConfig, save_config
+from core.ignore import ensure_managed_rules
 from ui.main_window import MainWindow
 from ui.settings_dialog import SettingsDialog
 
 def setup_ignored_files(vault_path: Path):
-    """Ensures .obsidian workspace files are ignored."""
-    gitignore = vault_path / ".gitignore"
-    
-    # Read template
-    try:
-        with open("ignore/gitignore_template", "r") as f:
-            template_lines = f.readlines()
-    except FileNotFoundError:
-        # Fallback if running from a different cwd or packed
-        template_lines = [
-            "\n# Cogit managed ignores\n",
-            ".obsidian/workspace*\n",
-            ".obsidian/cache\n",
-            ".obsidian/plugins/*/data.json\n"
-        ]
-
-    # Check if lines exist
-    current_content = ""
-    if gitignore.exists():
-        with open(gitignore, "r", encoding="utf-8") as f:
-            current_content = f.read()
-    
-    with open(gitignore, "a", encoding="utf-8") as f:
-        if "# Cogit managed ignores" not in current_content:
-            f.write("\n")
-            f.writelines(template_lines)
+    """Ensures the template ignore rules are in the vault's managed block."""
+    ensure_managed_rules(vault_path)
 
 def main():
     logging.basicConfig(level=logging.INFO)
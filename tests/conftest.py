@@ -0,0 +1,11 @@
+import pytest
+import git
+
+@pytest.fixture
+def repo(tmp_path):
+    """An empty vault repository on main with a commit identity set."""
+    repo = git.Repo.init(tmp_path / "vault", initial_branch="main")
+    with repo.config_writer() as cw:
+        cw.set_value("user", "name", "Test")
+        cw.set_value("user", "email", "test@example.com")
+    return repo
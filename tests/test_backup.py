@@ -0,0 +1,88 @@
+import pytest
+from pathlib import Path
+from core.backup import BundleBackup, load_manifest, restore_backup
+from core.config import CogitConfig
+from core.git import GitManager
+
+@pytest.fixture
+def backup(repo, tmp_path):
+    config = CogitConfig(vault_path=Path(repo.working_dir), backup_dir=tmp_path / "usb")
+    return BundleBackup(GitManager(Path(repo.working_dir), config))
+
+def commit(repo, name, content):
+    (Path(repo.working_dir) / name).write_text(content)
+    repo.git.add(A=True)
+    repo.index.commit(f"edit {name}")
+
+def test_backups_are_incremental(repo, backup, tmp_path):
+    commit(repo, "a.md", "one")
+    commit(repo, "b.md", "two")
+    assert "2 commit(s)" in backup.create()
+
+    assert backup.create() == "No new commits to back up."
+
+    commit(repo, "c.md", "three")
+    assert "1 commit(s)" in backup.create()
+
+    entries = load_manifest(tmp_path / "usb")
+    assert [entry.commits for entry in entries] == [2, 1]
+    assert entries[1].excluded == [entries[0].tips["refs/heads/main"]]
+    assert entries[1].tips["refs/heads/main"] == repo.head.commit.hexsha
+    assert backup.verify() == []
+
+def test_restore_applies_bundles_in_order(repo, backup, tmp_path):
+    commit(repo, "a.md", "one")
+    backup.create()
+    commit(repo, "b.md", "two")
+    backup.create()
+
+    restored = restore_backup(tmp_path / "usb", tmp_path / "restored")
+
+    assert restored.head.commit.hexsha == repo.head.commit.hexsha
+    assert (tmp_path / "restored" / "b.md").read_text() == "two"
+
+def test_verify_detects_corruption(repo, backup, tmp_path):
+    commit(repo, "a.md", "one")
+    backup.create()
+    entry = load_manifest(tmp_path / "usb")[0]
+    with open(tmp_path / "usb" / entry.file, "ab") as f:
+        f.write(b"garbage")
+
+    assert backup.verify() == [f"{entry.file}: checksum mismatch"]
+    with pytest.raises(RuntimeError, match="corrupted"):
+        restore_backup(tmp_path / "usb", tmp_path / "restored")
+
+def test_backup_requires_directory(repo):
+    commit(repo, "a.md", "one")
+    backup = BundleBackup(GitManager(Path(repo.working_dir)))
+    with pytest.raises(RuntimeError, match="No backup directory"):
+        backup.create()
+
+def test_exclusions_stay_small(repo, backup, tmp_path):
+    for i in range(5):
+        commit(repo, f"{i}.md", str(i))
+        backup.create()
+
+    entries = load_manifest(tmp_path / "usb")
+    assert [len(entry.excluded) for entry in entries] == [0, 1, 1, 1, 1]
+    assert entries[-1].excluded == [entries[-2].tips["refs/heads/main"]]
+
+def test_rewritten_branch_keeps_old_tip_excluded(repo, backup, tmp_path):
+    commit(repo, "a.md", "one")
+    base = repo.head.commit.hexsha
+    commit(repo, "b.md", "two")
+    backup.create()
+    old_tip = repo.head.commit.hexsha
+
+    # Rewrite: drop the last commit and make a different one
+    repo.git.reset("--hard", base)
+    commit(repo, "c.md", "three")
+    assert "1 commit(s)" in backup.create()
+    assert load_manifest(tmp_path / "usb")[-1].excluded == [old_tip]
+
+    commit(repo, "d.md", "four")
+    assert "1 commit(s)" in backup.create()
+    assert sorted(load_manifest(tmp_path / "usb")[-1].excluded) == sorted(
+        [old_tip, repo.head.commit.parents[0].hexsha]
+    )
+    assert backup.verify() == []
@@ -0,0 +1,88 @@
+import pytest
+from pathlib import Path
+from core.broker import GitBroker
+
+@pytest.fixture
+def repo(repo):
+    (Path(repo.working_dir) / "note.md").write_text("hello")
+    repo.git.add(A=True)
+    repo.index.commit("initial")
+    return repo
+
+@pytest.fixture
+def broker(repo):
+    broker = GitBroker(Path(repo.working_dir))
+    yield broker
+    broker.close()
+
+def test_object_info_reuses_helper(repo, broker):
+    head = repo.head.commit.hexsha
+    infos = broker.object_info(["HEAD", "HEAD:note.md", "does-not-exist"])
+
+    assert infos[0].sha == head
+    assert infos[0].type == "commit"
+    assert infos[1].type == "blob"
+    assert infos[1].size == 5
+    assert infos[2] is None
+
+    broker.resolve("HEAD")
+    assert broker.spawns == {"cat-file --batch-check": 1}
+
+def test_object_info_large_batch(repo, broker):
+    infos = broker.object_info(["HEAD"] * 5000)
+    assert len(infos) == 5000
+    assert all(info.type == "commit" for info in infos)
+
+def test_helper_sees_new_commits(repo, broker):
+    first = broker.resolve("HEAD")
+    (Path(repo.working_dir) / "other.md").write_text("more")
+    repo.git.add(A=True)
+    repo.index.commit("second")
+    assert broker.resolve("HEAD") != first
+    assert broker.resolve("HEAD") == repo.head.commit.hexsha
+
+def test_commit_time(repo, broker):
+    assert broker.commit_time("HEAD") == repo.head.commit.committed_date
+    assert broker.commit_time("missing-ref") is None
+
+def test_ahead_behind(repo, broker):
+    repo.create_head("old")
+    (Path(repo.working_dir) / "other.md").write_text("more")
+    repo.git.add(A=True)
+    repo.index.commit("second")
+
+    assert broker.ahead_behind("main", "old") == (1, 0)
+    assert broker.ahead_behind("old", "main") == (0, 1)
+
+def test_is_dirty(repo, broker):
+    assert broker.is_dirty() is False
+    (Path(repo.working_dir) / "untracked.md").write_text("new")
+    assert broker.is_dirty() is True
+
+def test_run_failure_and_report(broker):
+    with pytest.raises(RuntimeError, match="rev-parse"):
+        broker.run("rev-parse", "--verify", "nope")
+    assert "rev-parse=1" in broker.report()
+
+def test_dead_helper_is_reported_and_respawned(repo, broker):
+    broker.resolve("HEAD")
+    helper = broker._batch_check.proc
+    helper.kill()
+    helper.wait()
+    # Make the helper look alive so the request reaches the dead pipe
+    helper.poll = lambda: None
+
+    with pytest.raises(RuntimeError, match="git cat-file --batch-check failed"):
+        broker.object_info(["HEAD"])
+    assert broker._batch_check.proc is None
+
+    assert broker.resolve("HEAD") == repo.head.commit.hexsha
+    assert broker.spawns["cat-file --batch-check"] == 2
+
+def test_read_object_missing(broker):
+    assert broker.read_object("does-not-exist") is None
+
+def test_run_accepts_listed_exit_codes(broker):
+    assert broker.run("check-ignore", "--no-index", "nothing.md", ok_codes=(0, 1)) == ""
+    with pytest.raises(RuntimeError, match="check-ignore"):
+        broker.run("check-ignore", "--no-index", "nothing.md")
@@ -30,3 +30,60 @@ def test_load_nonexistent_config(mocker, tmp_path):
 
     loaded = load_config()
     assert loaded is None
+
+def test_push_guard_settings_round_trip(mocker, tmp_path):
+    mock_config_file = tmp_path / "config.toml"
+    mocker.patch("core.config.CONFIG_FILE", mock_config_file)
+    mocker.patch("core.config.CONFIG_DIR", tmp_path)
+
+    config = CogitConfig(
+        vault_path=Path("/tmp/vault"),
+        max_file_size_mb=50,
+        max_push_size_mb=500,
+        large_file_action="warn"
+    )
+    save_config(config)
+
+    loaded = load_config()
+    assert loaded.max_file_size_mb == 50
+    assert loaded.max_push_size_mb == 500
+    assert loaded.large_file_action == "warn"
+    assert loaded.backup_dir is None
+
+def test_backup_dir_round_trip(mocker, tmp_path):
+    mock_config_file = tmp_path / "config.toml"
+    mocker.patch("core.config.CONFIG_FILE", mock_config_file)
+    mocker.patch("core.config.CONFIG_DIR", tmp_path)
+
+    save_config(CogitConfig(vault_path=Path("/tmp/vault"), backup_dir=Path("/media/usb/cogit")))
+
+    assert load_config().backup_dir == Path("/media/usb/cogit")
+
+def test_unknown_large_file_action_falls_back_to_block(mocker, tmp_path, caplog):
+    mock_config_file = tmp_path / "config.toml"
+    mocker.patch("core.config.CONFIG_FILE", mock_config_file)
+    mock_config_file.write_text(
+        '[vault]\npath = "/tmp/vault"\n\n[push]\nlarge_file_action = "wran"\n',
+        encoding="utf-8"
+    )
+
+    loaded = load_config()
+    assert loaded.large_file_action == "block"
+    assert "wran" in caplog.text
+
+def test_invalid_size_limits_fall_back_to_defaults(mocker, tmp_path, caplog):
+    mock_config_file = tmp_path / "config.toml"
+    mocker.patch("core.config.CONFIG_FILE", mock_config_file)
+    mock_config_file.write_text(
+        '[vault]\npath = "/tmp/vault"\n\n'
+        '[push]\nmax_file_size_mb = "100MB"\nmax_push_size_mb = -5\n',
+        encoding="utf-8"
+    )
+
+    loaded = load_config()
+    assert loaded is not None
+    assert loaded.vault_path == Path("/tmp/vault")
+    assert loaded.max_file_size_mb == 100.0
+    assert loaded.max_push_size_mb == 2000.0
+    assert "max_file_size_mb" in caplog.text
+    assert "max_push_size_mb" in caplog.text
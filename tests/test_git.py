@@ -1,31 +1,37 @@
 import pytest
 from pathlib import Path
 import git
+from core.config import CogitConfig
 from core.git import GitManager
+from core.status import StatusChecker, RepoState
 
 @pytest.fixture
 def mock_repo(mocker):
     return mocker.MagicMock(spec=git.Repo)
 
+@pytest.fixture
+def mock_broker(mocker):
+    return mocker.patch("core.git.GitBroker").return_value
+
 def test_git_manager_init(mock_repo, mocker):
     mocker.patch("git.Repo", return_value=mock_repo)
     manager = GitManager(Path("/tmp/repo"))
     assert manager.get_repo() == mock_repo
 
-def test_has_changes(mock_repo, mocker):
+def test_has_changes(mock_repo, mock_broker, mocker):
     mocker.patch("git.Repo", return_value=mock_repo)
     manager = GitManager(Path("/tmp/repo"))
     
-    mock_repo.is_dirty.return_value = True
+    mock_broker.is_dirty.return_value = True
     assert manager.has_changes() is True
 
-    mock_repo.is_dirty.return_value = False
+    mock_broker.is_dirty.return_value = False
     assert manager.has_changes() is False
 
-def test_commit_all(mock_repo, mocker):
+def test_commit_all(mock_repo, mock_broker, mocker):
     mocker.patch("git.Repo", return_value=mock_repo)
     manager = GitManager(Path("/tmp/repo"))
-    mock_repo.is_dirty.return_value = True
+    mock_broker.is_dirty.return_value = True
     
     msg = "test commit"
     manager.commit_all(msg)
@@ -33,11 +39,153 @@ def test_commit_all(mock_repo, mocker):
     mock_repo.git.add.assert_called_with(A=True)
     mock_repo.index.commit.assert_called_with(msg)
 
-def test_commit_no_changes(mock_repo, mocker):
+def test_commit_no_changes(mock_repo, mock_broker, mocker):
     mocker.patch("git.Repo", return_value=mock_repo)
     manager = GitManager(Path("/tmp/repo"))
-    mock_repo.is_dirty.return_value = False
+    mock_broker.is_dirty.return_value = False
     
     result = manager.commit_all("msg")
     assert result == "No changes to commit."
     mock_repo.index.commit.assert_not_called()
+
+@pytest.fixture
+def cloned_repo(repo, tmp_path):
+    """A working clone with a bare local origin and one pushed commit."""
+    origin = git.Repo.init(tmp_path / "origin.git", bare=True, initial_branch="main")
+    (tmp_path / "vault" / "note.md").write_text("hello")
+    repo.git.add(A=True)
+    repo.index.commit("initial")
+    repo.create_remote("origin", str(origin.working_dir))
+    repo.git.push("-u", "origin", "main")
+    return repo
+
+def test_scan_outgoing_finds_oversized_blob(cloned_repo):
+    config = CogitConfig(vault_path=Path(cloned_repo.working_dir), max_file_size_mb=0.001)
+    manager = GitManager(Path(cloned_repo.working_dir), config)
+
+    (Path(cloned_repo.working_dir) / "small.md").write_text("tiny")
+    (Path(cloned_repo.working_dir) / "big.pdf").write_bytes(b"x" * 4096)
+    manager.commit_all("add files")
+
+    scan = manager.scan_outgoing()
+    assert [blob.path for blob in scan.oversized] == ["big.pdf"]
+    # commit, tree and two new blobs; the pushed note.md is excluded
+    assert scan.object_count == 4
+    assert scan.estimated_pack_size > 0
+    assert not scan.ok
+
+def test_scan_outgoing_nothing_to_push(cloned_repo):
+    manager = GitManager(Path(cloned_repo.working_dir))
+    scan = manager.scan_outgoing()
+    assert scan.object_count == 0
+    assert scan.ok
+
+def test_push_blocked_by_large_file(cloned_repo):
+    config = CogitConfig(vault_path=Path(cloned_repo.working_dir), max_file_size_mb=0.001)
+    manager = GitManager(Path(cloned_repo.working_dir), config)
+    (Path(cloned_repo.working_dir) / "big.pdf").write_bytes(b"x" * 4096)
+    manager.commit_all("add attachment")
+
+    with pytest.raises(RuntimeError, match="big.pdf"):
+        manager.push()
+    assert cloned_repo.head.commit != cloned_repo.remotes.origin.refs.main.commit
+
+def test_push_warns_on_large_file(cloned_repo):
+    config = CogitConfig(
+        vault_path=Path(cloned_repo.working_dir),
+        max_file_size_mb=0.001,
+        large_file_action="warn",
+    )
+    manager = GitManager(Path(cloned_repo.working_dir), config)
+    (Path(cloned_repo.working_dir) / "big.pdf").write_bytes(b"x" * 4096)
+    manager.commit_all("add attachment")
+
+    result = manager.push()
+    assert "Warning" in result
+    assert "Push successful." in result
+
+def test_fetch_only_configured_branch(cloned_repo):
+    cloned_repo.git.push("origin", "main:refs/heads/other")
+    cloned_repo.create_tag("v1")
+    cloned_repo.git.push("origin", "v1")
+    cloned_repo.git.update_ref("-d", "refs/remotes/origin/other")
+    cloned_repo.delete_tag("v1")
+
+    manager = GitManager(Path(cloned_repo.working_dir))
+    manager.fetch()
+
+    refs = cloned_repo.git.for_each_ref(format="%(refname)").splitlines()
+    assert "refs/remotes/origin/main" in refs
+    assert "refs/remotes/origin/other" not in refs
+    assert "refs/tags/v1" not in refs
+
+def test_fetch_tags_when_opted_in(cloned_repo):
+    cloned_repo.create_tag("v1")
+    cloned_repo.git.push("origin", "v1")
+    cloned_repo.delete_tag("v1")
+
+    config = CogitConfig(vault_path=Path(cloned_repo.working_dir), fetch_tags=True)
+    GitManager(Path(cloned_repo.working_dir), config).fetch()
+
+    assert "v1" in [tag.name for tag in cloned_repo.tags]
+
+def test_push_rejects_branch_mismatch(cloned_repo):
+    cloned_repo.git.checkout("-b", "draft")
+    manager = GitManager(Path(cloned_repo.working_dir))
+
+    with pytest.raises(RuntimeError, match="draft"):
+        manager.push()
+
+def test_pull_configured_branch(cloned_repo, tmp_path):
+    other = git.Repo.clone_from(cloned_repo.remotes.origin.url, tmp_path / "other")
+    with other.config_writer() as cw:
+        cw.set_value("user", "name", "Other")
+        cw.set_value("user", "email", "other@example.com")
+    (tmp_path / "other" / "remote.md").write_text("from another device")
+    other.git.add(A=True)
+    other.index.commit("remote edit")
+    other.git.push("origin", "main")
+
+    GitManager(Path(cloned_repo.working_dir)).pull()
+    assert (Path(cloned_repo.working_dir) / "remote.md").exists()
+
+def test_status_check_uses_fixed_spawns(cloned_repo):
+    manager = GitManager(Path(cloned_repo.working_dir))
+    checker = StatusChecker(manager)
+    assert checker.check_status().state == RepoState.UP_TO_DATE
+
+    # Helpers started by the first check stay alive; besides the network
+    # fetch, later checks only pay for status and rev-list
+    manager.broker.reset_counts()
+    for _ in range(3):
+        assert checker.check_status().state == RepoState.UP_TO_DATE
+    assert manager.broker.spawn_count == 6
+    assert manager.broker.spawns == {"status": 3, "rev-list": 3}
+
+def test_push_suggests_recommitting_without_large_files(cloned_repo):
+    config = CogitConfig(
+        vault_path=Path(cloned_repo.working_dir),
+        max_file_size_mb=0.001,
+        large_file_action="suggest",
+    )
+    manager = GitManager(Path(cloned_repo.working_dir), config)
+    (Path(cloned_repo.working_dir) / "big.pdf").write_bytes(b"x" * 4096)
+    manager.commit_all("add attachment")
+    (Path(cloned_repo.working_dir) / "later.md").write_text("newer commit on top")
+    manager.commit_all("later edit")
+
+    with pytest.raises(RuntimeError) as excinfo:
+        manager.push()
+
+    message = str(excinfo.value)
+    assert "git reset --soft refs/remotes/origin/main" in message
+    assert 'git rm --cached "big.pdf"' in message
+    assert "--amend" not in message
+    assert "@{u}" not in message
+
+    # Following the advice clears the guard
+    cloned_repo.git.reset("--soft", "refs/remotes/origin/main")
+    cloned_repo.git.rm("--cached", "big.pdf")
+    cloned_repo.index.commit("recommit without large files")
+    assert manager.scan_outgoing().ok
+    assert "Push successful." in manager.push()
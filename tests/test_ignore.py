@@ -0,0 +1,152 @@
+from pathlib import Path
+from core.git import GitManager
+from core.ignore import (
+    ChurnAnalyzer, IgnoreProposal, MANAGED_FOOTER, MANAGED_HEADER,
+    ensure_managed_rules, path_to_rule, load_template_rules, read_managed_rules, write_managed_rules,
+)
+
+def commit_files(repo, files):
+    for name, content in files.items():
+        path = Path(repo.working_dir) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    repo.git.add(A=True)
+    repo.index.commit("edit")
+
+def test_template_found_independent_of_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert ".obsidian/workspace*" in load_template_rules()
+
+def test_ensure_managed_rules_keeps_user_rules(tmp_path):
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text("*.tmp\n")
+
+    ensure_managed_rules(tmp_path)
+    ensure_managed_rules(tmp_path)
+
+    content = gitignore.read_text()
+    assert content.startswith("*.tmp\n")
+    assert content.count(MANAGED_HEADER) == 1
+    assert content.count(MANAGED_FOOTER) == 1
+    assert read_managed_rules(gitignore) == load_template_rules()
+
+def test_legacy_block_is_upgraded(tmp_path):
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text(f"*.tmp\n\n{MANAGED_HEADER}\n.obsidian/cache\n\nnotes/private/\n")
+
+    write_managed_rules(gitignore, [".obsidian/cache", ".trash/"])
+
+    lines = gitignore.read_text().splitlines()
+    assert lines[0] == "*.tmp"
+    assert "notes/private/" in lines
+    assert read_managed_rules(gitignore) == [".obsidian/cache", ".trash/"]
+
+def test_analyze_ranks_by_churn(repo):
+    commit_files(repo, {"note.md": "a", "plugin.json": "0"})
+    for i in range(5):
+        commit_files(repo, {"plugin.json": str(i + 1) * 100})
+
+    ranked = ChurnAnalyzer(GitManager(Path(repo.working_dir))).analyze()
+
+    assert ranked[0].path == "plugin.json"
+    assert ranked[0].changes == 6
+    assert ranked[0].bytes_added == 1 + 5 * 100
+    assert ranked[1].path == "note.md"
+    assert ranked[1].changes == 1
+
+def test_propose_skips_notes_and_groups_directories(repo):
+    for i in range(5):
+        commit_files(repo, {
+            "daily.md": f"entry {i}",
+            "state.json": str(i),
+            ".obsidian/cache/a": str(i),
+            ".obsidian/cache/b": str(i),
+            ".obsidian/cache/c": str(i),
+        })
+
+    proposals = ChurnAnalyzer(GitManager(Path(repo.working_dir))).propose()
+
+    rules = {p.rule for p in proposals}
+    assert rules == {"/.obsidian/cache/", "/state.json"}
+
+def test_propose_skips_already_ignored(repo):
+    (Path(repo.working_dir) / ".gitignore").write_text(
+        "state.json\n/état.json\n", encoding="utf-8"
+    )
+    for i in range(5):
+        (Path(repo.working_dir) / "state.json").write_text(str(i))
+        (Path(repo.working_dir) / "état.json").write_text(str(i))
+        repo.git.add("-f", "state.json", "état.json")
+        repo.index.commit("edit")
+
+    proposals = ChurnAnalyzer(GitManager(Path(repo.working_dir))).propose()
+    assert proposals == []
+
+def test_apply_untracks_matching_paths(repo):
+    for i in range(5):
+        commit_files(repo, {"state.json": str(i), "keep.bin": "x"})
+
+    analyzer = ChurnAnalyzer(GitManager(Path(repo.working_dir)))
+    message = analyzer.apply(analyzer.propose(), untrack=True)
+
+    assert "Stopped tracking 1 file(s)." in message
+    assert read_managed_rules(Path(repo.working_dir) / ".gitignore") == ["/state.json"]
+    tracked = repo.git.ls_files().splitlines()
+    assert "state.json" not in tracked
+    assert "keep.bin" in tracked
+    assert (Path(repo.working_dir) / "state.json").exists()
+
+def test_directory_with_notes_gets_per_file_rules(repo):
+    commit_files(repo, {"Projects/plan.md": "plan"})
+    for i in range(5):
+        commit_files(repo, {
+            "Projects/a.excalidraw": str(i),
+            "Projects/b.excalidraw": str(i),
+            "Projects/c.png": str(i),
+        })
+
+    analyzer = ChurnAnalyzer(GitManager(Path(repo.working_dir)))
+    proposals = analyzer.propose()
+
+    assert {p.rule for p in proposals} == {
+        "/Projects/a.excalidraw", "/Projects/b.excalidraw", "/Projects/c.png",
+    }
+    analyzer.apply(proposals, untrack=True)
+    tracked = repo.git.ls_files().splitlines()
+    assert tracked == ["Projects/plan.md"]
+
+def test_apply_never_untracks_notes(repo):
+    commit_files(repo, {"Projects/plan.md": "plan", "Projects/cache.bin": "x"})
+
+    analyzer = ChurnAnalyzer(GitManager(Path(repo.working_dir)))
+    analyzer.apply([IgnoreProposal(rule="/Projects/", paths=["Projects/cache.bin"])], untrack=True)
+
+    assert repo.git.ls_files().splitlines() == ["Projects/plan.md"]
+
+def test_root_rule_does_not_match_subfolders(repo):
+    commit_files(repo, {"sub/state.json": "keep"})
+    for i in range(5):
+        commit_files(repo, {"state.json": str(i)})
+
+    analyzer = ChurnAnalyzer(GitManager(Path(repo.working_dir)))
+    analyzer.apply(analyzer.propose(), untrack=True)
+
+    assert repo.git.ls_files().splitlines() == ["sub/state.json"]
+
+def test_rules_escape_special_characters(repo):
+    commit_files(repo, {"axxb.json": "keep", "#notes.json": "keep"})
+    for i in range(5):
+        commit_files(repo, {"a*b.json": str(i)})
+
+    analyzer = ChurnAnalyzer(GitManager(Path(repo.working_dir)))
+    proposals = analyzer.propose()
+    assert [p.rule for p in proposals] == ["/a\\*b.json"]
+
+    analyzer.apply(proposals, untrack=True)
+    assert sorted(repo.git.ls_files("-z").split("\0")[:-1]) == ["#notes.json", "axxb.json"]
+
+def test_path_to_rule():
+    assert path_to_rule("state.json") == "/state.json"
+    assert path_to_rule(".obsidian/cache", directory=True) == "/.obsidian/cache/"
+    assert path_to_rule("#a[1]!.png") == "/\\#a\\[1\\]\\!.png"
+    assert path_to_rule("trail ") == "/trail\\ "
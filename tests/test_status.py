@@ -12,9 +12,8 @@ def test_status_up_to_date(mock_git_manager, mocker):
     mock_git_manager.get_repo.return_value = repo
     mock_git_manager.has_changes.return_value = False
     
-    # Mock branch commits
-    repo.active_branch.commit = "hash1"
-    repo.active_branch.tracking_branch.return_value.commit = "hash1" # Same commit
+    # No commits on either side
+    mock_git_manager.ahead_behind.return_value = (0, 0)
     
     status = checker.check_status()
     assert status.state == RepoState.UP_TO_DATE
@@ -36,12 +35,8 @@ def test_status_local_ahead(mock_git_manager, mocker):
     mock_git_manager.get_repo.return_value = repo
     mock_git_manager.has_changes.return_value = False
 
-    repo.active_branch.commit = "local_hash"
-    repo.active_branch.tracking_branch.return_value.commit = "remote_hash"
-    
-    # is_ancestor(ancestor, rev)
-    # If remote is ancestor of local, Local is Ahead
-    repo.is_ancestor.side_effect = lambda a, b: a == "remote_hash" and b == "local_hash"
+    # Only local has new commits, Local is Ahead
+    mock_git_manager.ahead_behind.return_value = (2, 0)
 
     status = checker.check_status()
     assert status.state == RepoState.LOCAL_AHEAD
@@ -52,11 +47,25 @@ def test_status_remote_ahead(mock_git_manager, mocker):
     mock_git_manager.get_repo.return_value = repo
     mock_git_manager.has_changes.return_value = False
 
-    repo.active_branch.commit = "local_hash"
-    repo.active_branch.tracking_branch.return_value.commit = "remote_hash"
-
-    # If local is ancestor of remote, Remote is Ahead
-    repo.is_ancestor.side_effect = lambda a, b: a == "local_hash" and b == "remote_hash"
+    # Only remote has new commits, Remote is Ahead
+    mock_git_manager.ahead_behind.return_value = (0, 3)
 
     status = checker.check_status()
     assert status.state == RepoState.REMOTE_AHEAD
+
+def test_status_branch_mismatch(mock_git_manager, mocker):
+    checker = StatusChecker(mock_git_manager)
+    mock_git_manager.get_repo.return_value = mocker.MagicMock()
+    mock_git_manager.check_branch.side_effect = RuntimeError("branch mismatch")
+
+    status = checker.check_status()
+    assert status.state == RepoState.ERROR
+    mock_git_manager.fetch.assert_not_called()
+
+def test_status_diverged(mock_git_manager, mocker):
+    checker = StatusChecker(mock_git_manager)
+    mock_git_manager.has_changes.return_value = False
+    mock_git_manager.ahead_behind.return_value = (1, 1)
+
+    status = checker.check_status()
+    assert status.state == RepoState.DIVERGED
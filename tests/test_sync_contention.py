@@ -0,0 +1,60 @@
+import git
+from benchmarks.sync_contention import (
+    SimulationConfig, _count_lost_edits, _create_origin, run_simulation,
+)
+
+def test_simulation_converges(tmp_path):
+    config = SimulationConfig(
+        clients=2,
+        syncs_per_client=3,
+        sync_rate=50.0,
+        notes=3,
+        max_retries=10,
+        seed=42,
+    )
+
+    report = run_simulation(config, tmp_path)
+
+    assert report.converged
+    assert report.syncs + report.failures == 6
+    assert len(set(report.heads)) == 1
+    assert report.percentile(50) <= report.percentile(99)
+    assert report.edits == 6
+    assert 0 <= report.lost_edits <= report.edits
+    assert "Converged: yes" in report.format()
+    assert "Conflict strategy: pull -X ours" in report.format()
+
+def test_drain_pushes_stranded_commits(tmp_path):
+    # Without retries, syncs that lose the race leave commits behind
+    config = SimulationConfig(
+        clients=3,
+        syncs_per_client=3,
+        sync_rate=100.0,
+        notes=3,
+        max_retries=0,
+        seed=8,
+    )
+
+    report = run_simulation(config, tmp_path)
+
+    assert report.stranded_after_drain == 0
+    assert report.converged
+    assert "Stranded commits:" in report.format()
+
+def test_count_lost_edits(tmp_path):
+    config = SimulationConfig(notes=2)
+    origin = _create_origin(tmp_path, config)
+    seed = git.Repo(tmp_path / "seed")
+    with open(tmp_path / "seed" / "note-0.md", "a", encoding="utf-8") as f:
+        f.write("- device-0 edit 0\n")
+    seed.git.add(A=True)
+    seed.index.commit("edit")
+    seed.git.push(str(origin), "main:main")
+
+    edits = [
+        ("note-0.md", "- device-0 edit 0"),
+        ("note-0.md", "- device-1 edit 0"),
+        ("note-1.md", "- device-1 edit 1"),
+        ("missing.md", "- device-1 edit 2"),
+    ]
+    assert _count_lost_edits(origin, "main", edits) == 3
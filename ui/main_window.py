@@ -6,7 +6,9 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QPalette
 
 from core.config import CogitConfig, save_config
+from core.backup import BundleBackup
 from core.git import GitManager
+from core.ignore import ChurnAnalyzer
 from core.status import StatusChecker, RepoState
 from core.session import get_session_start_message, get_session_end_message
 from ui.settings_dialog import SettingsDialog
@@ -29,9 +31,13 @@ class MainWindow(QMainWindow):
         self.log("Cogit started.")
 
     def init_core(self):
+        # Stop the previous manager's git helpers before replacing it
+        if getattr(self, "git_manager", None):
+            self.git_manager.close()
+
         try:
             # We use vault_path (alias repo_path) for git operations
-            self.git_manager = GitManager(self.config.vault_path)
+            self.git_manager = GitManager(self.config.vault_path, self.config)
             self.status_checker = StatusChecker(self.git_manager)
         except Exception as e:
             QMessageBox.critical(self, "Initialization Error", f"Failed to initialize Git: {e}")
@@ -102,10 +108,16 @@ class MainWindow(QMainWindow):
         footer_layout = QHBoxLayout()
         self.settings_btn = QPushButton("Settings")
         self.settings_btn.clicked.connect(self.open_settings)
+        self.ignore_btn = QPushButton("Suggest Ignores")
+        self.ignore_btn.clicked.connect(self.suggest_ignores)
+        self.backup_btn = QPushButton("Backup")
+        self.backup_btn.clicked.connect(self.backup)
         self.quit_btn = QPushButton("Quit")
         self.quit_btn.clicked.connect(self.close)
         
         footer_layout.addWidget(self.settings_btn)
+        footer_layout.addWidget(self.ignore_btn)
+        footer_layout.addWidget(self.backup_btn)
         footer_layout.addStretch()
         footer_layout.addWidget(self.quit_btn)
         layout.addLayout(footer_layout)
@@ -172,6 +184,43 @@ class MainWindow(QMainWindow):
             self.log(f"Error pushing: {e}")
             QMessageBox.critical(self, "Push Error", str(e))
 
+    def suggest_ignores(self):
+        if not self.git_manager: return
+        self.log("Analyzing file churn...")
+        try:
+            analyzer = ChurnAnalyzer(self.git_manager)
+            proposals = analyzer.propose()[:15]
+            if not proposals:
+                self.log("No high-churn files found.")
+                return
+
+            lines = [
+                f"{p.rule}  ({p.changes} changes, {p.bytes_added / 1024:.0f} KB)"
+                for p in proposals
+            ]
+            answer = QMessageBox.question(
+                self, "Suggest Ignores",
+                "These files change often and bloat your commits:\n\n"
+                + "\n".join(lines)
+                + "\n\nAdd them to .gitignore and stop tracking them?"
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                self.log(analyzer.apply(proposals, untrack=True))
+                self.check_status()
+        except Exception as e:
+            self.log(f"Error analyzing ignores: {e}")
+            QMessageBox.critical(self, "Ignore Error", str(e))
+
+    def backup(self):
+        if not self.git_manager: return
+        self.log("Writing backup bundle...")
+        try:
+            result = BundleBackup(self.git_manager).create()
+            self.log(result)
+        except Exception as e:
+            self.log(f"Error backing up: {e}")
+            QMessageBox.critical(self, "Backup Error", str(e))
+
     def open_settings(self):
         dialog = SettingsDialog(self.config, self)
         if dialog.exec():
@@ -184,6 +233,11 @@ class MainWindow(QMainWindow):
                 self.log("Settings saved.")
                 self.check_status()
 
+    def closeEvent(self, event):
+        if self.git_manager:
+            self.git_manager.close()
+        super().closeEvent(event)
+
     def update_ui_config(self):
         self.vault_label.setText(f"Vault: {self.config.vault_path}")
         self.branch_label.setText(f"Branch: {self.config.branch}")
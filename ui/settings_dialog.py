@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QFileDialog, QFormLayout, QMessageBox
 )
+from dataclasses import replace
 from pathlib import Path
 from core.config import CogitConfig
 
@@ -31,6 +32,15 @@ class SettingsDialog(QDialog):
         self.branch_input = QLineEdit(self.config.branch)
         form.addRow("Branch:", self.branch_input)
 
+        # Backup folder (optional, e.g. a USB drive)
+        self.backup_input = QLineEdit(str(self.config.backup_dir or ""))
+        self.backup_btn = QPushButton("Browse")
+        self.backup_btn.clicked.connect(self.browse_backup)
+        backup_layout = QHBoxLayout()
+        backup_layout.addWidget(self.backup_input)
+        backup_layout.addWidget(self.backup_btn)
+        form.addRow("Backup Folder:", backup_layout)
+
         layout.addLayout(form)
 
         # Buttons
@@ -50,6 +60,11 @@ class SettingsDialog(QDialog):
         if path:
             self.vault_input.setText(path)
 
+    def browse_backup(self):
+        path = QFileDialog.getExistingDirectory(self, "Select Backup Folder", self.backup_input.text())
+        if path:
+            self.backup_input.setText(path)
+
     def save(self):
         vault_path = Path(self.vault_input.text())
         
@@ -57,9 +72,12 @@ class SettingsDialog(QDialog):
             QMessageBox.warning(self, "Invalid Path", "Vault path does not exist.")
             return
 
-        self.updated_config = CogitConfig(
+        # Keep settings that are not editable in this dialog
+        self.updated_config = replace(
+            self.config,
             vault_path=vault_path,
-            branch=self.branch_input.text()
+            branch=self.branch_input.text(),
+            backup_dir=Path(self.backup_input.text()) if self.backup_input.text().strip() else None
         )
         self.accept()
 